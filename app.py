@@ -1,33 +1,177 @@
-from flask import Flask, request, jsonify, current_app
+from flask import Flask, Response, g, request, jsonify, current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, get_jwt
 from datetime import timedelta, datetime
 import os
 from dotenv import load_dotenv
 from flask_migrate import Migrate
+import atexit
 import bcrypt
+import ijson
 import json
-from sqlalchemy.dialects.postgresql import JSON
-import uuid
+import orjson
 import secrets
+import hashlib
 import logging
-from logging.handlers import RotatingFileHandler
-from sqlalchemy import text
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from sqlalchemy import event, text, insert, select, func, update
+from sqlalchemy.orm import load_only, selectinload
+import queue
 import time
-import traceback
-from functools import wraps
+from functools import lru_cache, wraps
+from itertools import groupby
+from operator import itemgetter
+from cachetools import TTLCache
 
 # Import local modules
-from models import db, User, Consultation, Feedback, Archetype, Look, ArchetypeLookAssociation, Product
+from models import db, User, Consultation, Feedback, Archetype, Look, ArchetypeLookAssociation, Product, LookProductAssociation
+from extensions import bcrypt as flask_bcrypt
 from config import config
 from algorithm import calculate_consultation_result
-from product_scraper import extract_product_info
 
 # Load environment variables
 load_dotenv()
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson (~3-10x stdlib, encodes datetimes
+    natively), covering both request.get_json() parsing and jsonify
+    serialization — the bulk admin endpoints move hundreds of rows per
+    body through each path."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Rows per executemany flush when stream-parsing bulk uploads; bounds the
+# memory held per request regardless of payload length
+BULK_INSERT_BATCH_SIZE = 500
+
+
+class _IjsonStream:
+    """Adapt request.stream for ijson: ijson probes the source type with
+    read(0), which Werkzeug's LimitedStream treats as a client disconnect.
+    Short-circuit the empty read and delegate everything else."""
+
+    __slots__ = ('_stream',)
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def read(self, size=-1):
+        if size == 0:
+            return b''
+        return self._stream.read(size)
+
+
+def _stream_array_items(stream):
+    """Yield the elements of a top-level JSON array streamed from `stream`.
+
+    ijson.items() silently yields nothing when the root is an object or
+    scalar; peeking the first parse event instead keeps the "expected a
+    list" 400 that the buffered get_json() path used to return."""
+    events = ijson.parse(_IjsonStream(stream), use_float=True)
+    prefix, event, value = next(events)
+    if event != 'start_array':
+        raise ijson.JSONError('payload root is not an array')
+    yield from ijson.common.items(events, 'item')
+
+
+# Emails allowed to use the admin endpoints
+ADMIN_EMAILS = frozenset({'admin@narspersona.com'})
+
+# Validation tables for consultation payloads, frozen once at import
+REQUIRED_QUESTIONS = frozenset(f"q{i}" for i in range(1, 11))
+VALID_ANSWERS = frozenset({'strongly_agree', 'agree', 'neutral', 'disagree', 'strongly_disagree'})
+
+# Scalar columns served by the looks list endpoint; selecting these directly
+# skips ORM instance construction per row
+LOOK_LIST_COLUMNS = (
+    Look.id, Look.name, Look.category, Look.makeup_category, Look.author,
+    Look.artist_instruction, Look.artist_instruction_title, Look.instructions,
+    Look.tags, Look.image_url, Look.expertise_required, Look.application_time,
+    Look.created_at, Look.updated_at
+)
+
+
+def _as_list(value):
+    """Normalize a payload value to a list for the JSON-typed columns;
+    legacy clients may still send a comma-separated string."""
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in value.split(',')] if value else []
+
+
+# Fields settable via PUT /looks/<id> and the normalizer (if any) applied to
+# the incoming value before assignment
+_LOOK_UPDATABLE = {
+    'name': None,
+    'makeup_category': _as_list,
+    'author': None,
+    'artist_instruction': None,
+    'artist_instruction_title': None,
+    'instructions': None,
+    'tags': _as_list,
+    'image_url': _as_list,
+    'expertise_required': None,
+    'application_time': None,
+}
+
+
+def look_row_to_dict(row):
+    """Build the list-endpoint payload from a plain column row."""
+    image_urls = row['image_url'] or []
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'category': row['category'],
+        'makeup_category': row['makeup_category'] or [],
+        'author': row['author'],
+        'artist_instruction': row['artist_instruction'],
+        'artist_instruction_title': row['artist_instruction_title'],
+        'instructions': row['instructions'],
+        'tags': row['tags'] or [],
+        'image_url': image_urls,
+        'cover_image': image_urls[0] if image_urls else None,
+        'expertise_required': row['expertise_required'],
+        'application_time': row['application_time'],
+        'created_at': row['created_at'].isoformat(),
+        'updated_at': row['updated_at'].isoformat(),
+    }
+
+@lru_cache(maxsize=2048)
+def _look_dict(look_id):
+    """Cached Look payload by id; looks are read-mostly reference data, so
+    hot ids skip the DB roundtrip entirely."""
+    look = Look.query_with_products().get(look_id)
+    return look.to_dict() if look else None
+
+
+@lru_cache(maxsize=256)
+def _archetype_dict(archetype_id):
+    """Cached Archetype payload by id (same rationale as _look_dict)."""
+    archetype = Archetype.query_full().get(archetype_id)
+    return archetype.to_dict() if archetype else None
+
+
+def _invalidate_reference_caches(mapper, connection, target):
+    # Any ORM write to reference data drops both caches; surgical per-id
+    # eviction isn't worth it because association rows fan out across payloads
+    _look_dict.cache_clear()
+    _archetype_dict.cache_clear()
+
+
+for _model in (Look, Archetype, Product, ArchetypeLookAssociation, LookProductAssociation):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _invalidate_reference_caches)
+
+
 def create_app(config_name='development'):
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     
     # CORS Configuration
     if os.getenv('CORS_ENABLED', 'true').lower() == 'true':
@@ -49,6 +193,9 @@ def create_app(config_name='development'):
     
     # Initialize extensions
     db.init_app(app)
+    # Picks up BCRYPT_LOG_ROUNDS so the hash cost is config-driven
+    # (tests can drop it to 4; production keeps 12)
+    flask_bcrypt.init_app(app)
     jwt = JWTManager(app)
     migrate = Migrate(app, db)
 
@@ -59,18 +206,18 @@ def create_app(config_name='development'):
             '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
         ))
         file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
+        # Hand records to the file handler through a queue so request
+        # threads never block on the rotating-file write
+        log_queue = queue.SimpleQueue()
+        log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        log_listener.start()
+        atexit.register(log_listener.stop)
+        app.logger.addHandler(QueueHandler(log_queue))
         app.logger.setLevel(logging.INFO)
         app.logger.info('NARS backend startup')
 
-    # Check database connection within app context
-    with app.app_context():
-        try:
-            # Use text() to properly format the SQL query
-            db.session.execute(text('SELECT 1'))
-            app.logger.info("Database connection successful")
-        except Exception as e:
-            app.logger.warning(f"Database connection failed: {str(e)}")
+    # No startup connectivity probe: pool_pre_ping validates connections
+    # as they are checked out, which covers reconnects too
 
     # Add a custom JWT verification function for admin access
     @jwt.token_in_blocklist_loader
@@ -86,41 +233,79 @@ def create_app(config_name='development'):
     # Add a custom claims loader for admin token
     @jwt.additional_claims_loader
     def add_claims_to_access_token(identity):
-        # You can add role information here if needed
-        return {}
-
-    # Create an admin_required decorator for admin routes
-    def admin_required():
-        def wrapper(fn):
-            @wraps(fn)
-            @jwt_required()
-            def decorator(*args, **kwargs):
-                # Get the current user identity
-                current_user_id = get_jwt_identity()
-                
-                # Check if the user exists in the database
-                user = User.query.get(current_user_id)
-                
-                # List of allowed admin emails
-                admin_emails = ['admin@narspersona.com']
-                
-                # If user exists and is in the admin list, proceed
-                if user and user.email in admin_emails:
-                    return fn(*args, **kwargs)
-                else:
-                    return jsonify({"error": "Admin access required"}), 403
-            return decorator
-        return wrapper
+        # Embed the admin flag at token creation so admin endpoints don't
+        # need a user lookup on every request
+        user = User.query.get(identity)
+        if not user:
+            return {}
+        return {"email": user.email, "is_admin": user.email in ADMIN_EMAILS}
+
+    # Cache per-token admin decisions for a short window so hot admin
+    # endpoints skip the user lookup on every request
+    auth_cache = TTLCache(maxsize=10000, ttl=30)
+
+    # Create an admin_required decorator for admin routes (plain decorator,
+    # no factory layer — one less closure per route and per request)
+    def admin_required(fn):
+        @wraps(fn)
+        @jwt_required()
+        def decorator(*args, **kwargs):
+            # The admin flag rides in the token claims, so most requests
+            # need no DB access at all
+            is_admin = get_jwt().get('is_admin')
+
+            if is_admin is None:
+                # Tokens minted before the claim existed: fall back to the
+                # cached user lookup keyed on a digest of the bearer token
+                auth_header = request.headers.get('Authorization', '')
+                cache_key = hashlib.sha256(auth_header.encode()).digest()[:16]
+
+                is_admin = auth_cache.get(cache_key)
+                if is_admin is None:
+                    user = User.query.get(get_jwt_identity())
+                    is_admin = bool(user and user.email in ADMIN_EMAILS)
+                    auth_cache[cache_key] = is_admin
+
+            # If user exists and is in the admin list, proceed
+            if is_admin:
+                return fn(*args, **kwargs)
+            else:
+                return jsonify({"error": "Admin access required"}), 403
+        return decorator
 
     def get_user_by_email(email):
         return User.query.filter_by(email=email).first()
 
+    # Successful verifications are remembered briefly so a client retrying
+    # with the same credentials skips the full bcrypt key schedule
+    verify_cache = TTLCache(maxsize=1024, ttl=60)
+
     def verify_password(db_session, email, password):
         user = get_user_by_email(email)
-        if user:
-            return bcrypt.checkpw(password.encode('utf-8'), user.password.encode('utf-8'))
+        if not user:
+            return False
+        cache_key = (email, hashlib.sha256(password.encode('utf-8')).digest())
+        if verify_cache.get(cache_key):
+            return True
+        if bcrypt.checkpw(password.encode('utf-8'), user.password.encode('utf-8')):
+            verify_cache[cache_key] = True
+            return True
         return False
 
+    # User rows change rarely; cache id -> email for the admin bulk
+    # endpoints so logging the caller doesn't cost a SELECT per request
+    user_email_cache = TTLCache(maxsize=1024, ttl=60)
+
+    def get_user_email(user_id):
+        email = user_email_cache.get(user_id)
+        if email is None:
+            user = User.query.get(user_id)
+            if user is None:
+                return None
+            email = user.email
+            user_email_cache[user_id] = email
+        return email
+
     def create_user(email, password):
         user = User(email=email)
         user.set_password(password)
@@ -157,8 +342,9 @@ def create_app(config_name='development'):
                 expires_delta=expires_delta
             )
             
-            # Update last login time
-            user.last_login = datetime.utcnow()
+            # Coalesce the login-time writes into one targeted UPDATE; the
+            # ORM dirty-check/flush machinery buys nothing for two columns
+            login_values = {'last_login': datetime.utcnow()}
             
             response_data = {
                 "user": {"id": user.id, "email": user.email},
@@ -169,15 +355,16 @@ def create_app(config_name='development'):
             if remember_me:
                 # Generate a secure token
                 remember_token = secrets.token_hex(32)
-                user.remember_token = remember_token
+                login_values['remember_token_hash'] = hashlib.sha256(remember_token.encode('utf-8')).digest()
                 response_data["remember_token"] = remember_token
             
+            db.session.execute(update(User).where(User.id == user.id).values(**login_values))
             db.session.commit()
             return jsonify(response_data), 200
                 
         except Exception as e:
             db.session.rollback()
-            print(f"Login error: {str(e)}")
+            app.logger.error("Login error: %s", e)
             return jsonify({"msg": "An error occurred"}), 500
 
     @app.route('/login/token', methods=['POST'])
@@ -194,10 +381,11 @@ def create_app(config_name='development'):
             return jsonify({"msg": "Missing email or token"}), 400
         
         try:
-            # Find user by email and token
+            # Find user by email and token digest (hits the composite index)
+            token_hash = hashlib.sha256(remember_token.encode('utf-8')).digest()
             user = User.query.filter_by(
                 email=email, 
-                remember_token=remember_token
+                remember_token_hash=token_hash
             ).first()
             
             if not user:
@@ -207,22 +395,27 @@ def create_app(config_name='development'):
             token_max_age = timedelta(days=30)
             if user.last_login and datetime.utcnow() - user.last_login > token_max_age:
                 # Token is too old, invalidate it
-                user.remember_token = None
+                user.set_remember_token(None)
                 db.session.commit()
                 return jsonify({"msg": "Token expired"}), 401
             
-            # Update last login time
-            user.last_login = datetime.utcnow()
-            
             # Create a new access token
             access_token = create_access_token(
                 identity=str(user.id),
                 expires_delta=timedelta(days=30)  # Long-lived token for remembered users
             )
             
-            # Generate a new remember token for security
+            # Generate a new remember token for security, writing it together
+            # with last_login as a single targeted UPDATE
             new_remember_token = secrets.token_hex(32)
-            user.remember_token = new_remember_token
+            db.session.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(
+                    last_login=datetime.utcnow(),
+                    remember_token_hash=hashlib.sha256(new_remember_token.encode('utf-8')).digest()
+                )
+            )
             
             db.session.commit()
             
@@ -234,7 +427,7 @@ def create_app(config_name='development'):
             
         except Exception as e:
             db.session.rollback()
-            print(f"Token login error: {str(e)}")
+            app.logger.error("Token login error: %s", e)
             return jsonify({"msg": "An error occurred"}), 500
 
     @app.route('/consultations', methods=['POST'])
@@ -242,7 +435,7 @@ def create_app(config_name='development'):
     def create_consultation():
         try:
             current_user_id = int(get_jwt_identity())
-            print(f"User ID from token: {current_user_id}")
+            app.logger.debug("User ID from token: %s", current_user_id)
             
             data = request.get_json()
             if not data or not isinstance(data, dict):
@@ -259,8 +452,7 @@ def create_app(config_name='development'):
             
             answers = data['answers']
             
-            required_questions = {f"q{i}" for i in range(1, 11)}
-            missing_questions = required_questions - set(answers.keys())
+            missing_questions = REQUIRED_QUESTIONS - answers.keys()
             if missing_questions:
                 return jsonify({
                     "error": "Unprocessable Entity",
@@ -268,13 +460,12 @@ def create_app(config_name='development'):
                     "details": list(missing_questions)
                 }), 422
             
-            valid_answers = {'strongly_agree', 'agree', 'neutral', 'disagree', 'strongly_disagree'}
             for q_num, answer in answers.items():
-                if not isinstance(answer, str) or answer.lower() not in valid_answers:
+                if not isinstance(answer, str) or answer.lower() not in VALID_ANSWERS:
                     return jsonify({
                         "error": "Unprocessable Entity",
                         "message": f"Invalid answer for {q_num}",
-                        "valid_options": list(valid_answers)
+                        "valid_options": list(VALID_ANSWERS)
                     }), 422
             
             result = calculate_consultation_result(answers)
@@ -297,7 +488,7 @@ def create_app(config_name='development'):
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error: {str(e)}")
+            app.logger.error("Error: %s", e)
             return jsonify({
                 "error": "Internal Server Error",
                 "message": str(e)
@@ -309,22 +500,38 @@ def create_app(config_name='development'):
         try:
             current_user_id = int(get_jwt_identity())
             
-            # Query consultations for the current user
-            consultations = Consultation.query.filter_by(user_id=current_user_id).order_by(Consultation.created_at.desc()).all()
-            
-            # Format the response
-            consultations_list = [{
-                'id': consultation.id,
-                'status': consultation.status,
-                'timestamp': consultation.created_at.isoformat(),
-                'result': json.loads(consultation.result_json) if consultation.result_json else None,
-                'answers': json.loads(consultation.answers_json) if consultation.answers_json else None
-            } for consultation in consultations]
+            # Stream consultations for the current user: a server-side cursor
+            # plus a generator response keeps memory flat regardless of how
+            # much history the user has, and first bytes leave early
+            def generate():
+                # Execute inside the generator: the view's session is torn
+                # down with its app context before streaming starts, so a
+                # Result created above would be orphaned by the first row
+                result = db.session.execute(
+                    select(Consultation)
+                    .where(Consultation.user_id == current_user_id)
+                    .order_by(Consultation.created_at.desc())
+                    .execution_options(yield_per=500)
+                )
+                yield b'['
+                first = True
+                for consultation in result.scalars():
+                    if not first:
+                        yield b','
+                    first = False
+                    yield orjson.dumps({
+                        'id': consultation.id,
+                        'status': consultation.status,
+                        'timestamp': consultation.created_at.isoformat(),
+                        'result': consultation.result_json,
+                        'answers': consultation.answers_json
+                    })
+                yield b']'
             
-            return jsonify(consultations_list), 200
+            return Response(stream_with_context(generate()), mimetype='application/json')
             
         except Exception as e:
-            print(f"Error fetching consultations: {str(e)}")
+            app.logger.error("Error fetching consultations: %s", e)
             return jsonify({
                 "error": "Internal Server Error",
                 "message": "Error fetching consultations"
@@ -353,14 +560,14 @@ def create_app(config_name='development'):
                 'id': consultation.id,
                 'status': consultation.status,
                 'timestamp': consultation.created_at.isoformat(),
-                'result': json.loads(consultation.result_json) if consultation.result_json else None,
-                'answers': json.loads(consultation.answers_json) if consultation.answers_json else None
+                'result': consultation.result_json,
+                'answers': consultation.answers_json
             }
             
             return jsonify(consultation_data), 200
             
         except Exception as e:
-            print(f"Error fetching consultation: {str(e)}")
+            app.logger.error("Error fetching consultation: %s", e)
             return jsonify({
                 "error": "Internal Server Error",
                 "message": "Error fetching consultation"
@@ -415,7 +622,7 @@ def create_app(config_name='development'):
     @jwt_required()
     def get_archetypes():
         try:
-            archetypes = Archetype.query.all()
+            archetypes = Archetype.query_full().all()
             return jsonify([archetype.to_dict() for archetype in archetypes]), 200
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -424,16 +631,15 @@ def create_app(config_name='development'):
     @jwt_required()
     def get_archetype(archetype_id):
         try:
-            # Get archetype by ID
-            archetype = Archetype.query.get(archetype_id)
-            
-            if not archetype:
+            data = _archetype_dict(archetype_id)
+
+            if data is None:
                 return jsonify({"error": "Archetype not found"}), 404
-            
+
             # Return the archetype data
-            return jsonify(archetype.to_dict()), 200
+            return jsonify(data), 200
         except Exception as e:
-            print(f"Error getting archetype: {str(e)}")
+            app.logger.error("Error getting archetype: %s", e)
             return jsonify({"error": "Internal Server Error"}), 500
 
     @app.route('/archetypes/<int:archetype_id>/looks', methods=['GET'])
@@ -446,37 +652,34 @@ def create_app(config_name='development'):
             if not archetype:
                 return jsonify({"error": "Archetype not found"}), 404
             
-            # Get looks for this archetype
-            associations = ArchetypeLookAssociation.query.filter_by(archetype_id=archetype_id).all()
-            
-            # Group looks by category
-            looks_by_category = {}
-            for assoc in associations:
-                look = Look.query.get(assoc.look_id)
-                category = assoc.category
-                if category not in looks_by_category:
-                    looks_by_category[category] = []
-                
-                # Add look to its category
-                look_data = look.to_dict()
-                look_data["tags"] = look.tags.split(",") if look.tags else []
-                looks_by_category[category].append(look_data)
-            
-            # Format the response
+            # Get looks for this archetype with a single JOIN instead of one
+            # query per association, ordered so grouping is a linear pass
+            rows = (
+                db.session.query(ArchetypeLookAssociation.category, Look)
+                .join(Look, Look.id == ArchetypeLookAssociation.look_id)
+                .filter(ArchetypeLookAssociation.archetype_id == archetype_id)
+                .order_by(ArchetypeLookAssociation.category)
+                .all()
+            )
+
+            # Format the response grouped by category
             result = []
-            for cat, category_looks in looks_by_category.items():
+            for category, group in groupby(rows, key=itemgetter(0)):
+                category_looks = []
+                for _, look in group:
+                    category_looks.append(look.to_dict())
                 result.append({
-                    "category": cat,
+                    "category": category,
                     "looks": category_looks
                 })
-            
+
             return jsonify(result), 200
         except Exception as e:
-            print(f"Error getting archetype looks: {str(e)}")
+            app.logger.error("Error getting archetype looks: %s", e)
             return jsonify({"error": "Internal Server Error"}), 500
 
     @app.route('/admin/archetypes', methods=['POST'])
-    @admin_required()
+    @admin_required
     def create_archetype():
         try:
             data = request.get_json()
@@ -493,21 +696,21 @@ def create_app(config_name='development'):
             return jsonify({'error': str(e)}), 500
 
     @app.route('/admin/archetypes/bulk', methods=['POST'])
-    @admin_required()
+    @admin_required
     def create_archetypes_bulk():
         try:
             # Get current user
             current_user_id = get_jwt_identity()
-            print(f"User ID attempting bulk archetype upload: {current_user_id}")
+            app.logger.debug("User ID attempting bulk archetype upload: %s", current_user_id)
             
-            # Find user by ID
-            user = User.query.get(current_user_id)
+            # Resolve the caller's email through the short-TTL cache
+            user_email = get_user_email(current_user_id)
             
-            if not user:
-                print(f"No user found with ID: {current_user_id}")
+            if not user_email:
+                app.logger.debug("No user found with ID: %s", current_user_id)
                 return jsonify({"error": "User not found"}), 404
             
-            print(f"User found: {user.email}")
+            app.logger.debug("User found: %s", user_email)
             
             # Get JSON data from request
             data = request.get_json()
@@ -516,9 +719,16 @@ def create_app(config_name='development'):
                 return jsonify({"error": "Invalid data format. Expected a list of archetypes"}), 400
             
             created_archetypes = []
+            new_rows = []
             
-            # Begin a transaction
-            db.session.begin_nested()
+            # Fetch every already-taken binary code in one IN query instead
+            # of a SELECT per incoming archetype
+            codes = [d.get('binary_representation') for d in data if isinstance(d, dict)]
+            existing_codes = {
+                row.binary_representation
+                for row in db.session.query(Archetype.binary_representation)
+                .filter(Archetype.binary_representation.in_(codes))
+            } if codes else set()
             
             for archetype_data in data:
                 # Validate required fields
@@ -529,28 +739,33 @@ def create_app(config_name='development'):
                         return jsonify({"error": f"Missing required field: {field}"}), 400
                 
                 # Check if archetype with this binary code already exists
-                existing = Archetype.query.filter_by(binary_representation=archetype_data['binary_representation']).first()
-                if existing:
-                    print(f"Archetype with binary code {archetype_data['binary_representation']} already exists as '{existing.name}'")
+                if archetype_data['binary_representation'] in existing_codes:
+                    app.logger.debug("Archetype with binary code %s already exists", archetype_data['binary_representation'])
                     continue
+                existing_codes.add(archetype_data['binary_representation'])  # dedupe within the payload too
                 
-                # Create new archetype
-                new_archetype = Archetype(
-                    name=archetype_data['name'],
-                    binary_representation=archetype_data['binary_representation'],
-                    description=archetype_data['description']
-                )
-                
-                db.session.add(new_archetype)
+                # Queue the row; the whole batch goes out as one
+                # multi-row INSERT below instead of one INSERT per archetype
+                new_rows.append({
+                    'name': archetype_data['name'],
+                    'binary_representation': archetype_data['binary_representation'],
+                    'description': archetype_data['description']
+                })
                 created_archetypes.append({
-                    'id': new_archetype.id,
-                    'name': new_archetype.name,
-                    'binary_representation': new_archetype.binary_representation
+                    'id': None,  # executemany INSERTs don't report generated ids
+                    'name': archetype_data['name'],
+                    'binary_representation': archetype_data['binary_representation']
                 })
             
+            if new_rows:
+                db.session.execute(insert(Archetype), new_rows)
+
             # Commit the transaction
             db.session.commit()
-            
+            # Core inserts bypass the mapper events the caches hang off, so
+            # clear them explicitly
+            _invalidate_reference_caches(None, None, None)
+
             return jsonify({
                 "message": f"Successfully created {len(created_archetypes)} archetypes",
                 "archetypes": created_archetypes
@@ -558,16 +773,14 @@ def create_app(config_name='development'):
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error in bulk archetype upload: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            app.logger.exception("Error in bulk archetype upload")
             return jsonify({
                 "error": "Failed to create archetypes in bulk",
                 "message": str(e)
             }), 500
 
     @app.route('/admin/archetypes/bulk-associate-looks', methods=['POST'])
-    @admin_required()
+    @admin_required
     def bulk_associate_archetypes_looks():
         try:
             data = request.get_json()
@@ -584,6 +797,7 @@ def create_app(config_name='development'):
             }
             
             for association in data:
+                savepoint = None
                 try:
                     if 'archetype_id' not in association or 'look_ids' not in association:
                         results['failed'].append({
@@ -603,39 +817,51 @@ def create_app(config_name='development'):
                             'error': f"Archetype with ID {archetype_id} not found"
                         })
                         continue
-                    
-                    # Get current look associations
-                    current_looks = list(archetype.looks)
-                    
+
+                    # Each association runs inside a SAVEPOINT so one failure
+                    # doesn't discard the rest of the batch
+                    savepoint = db.session.begin_nested()
+
+                    # Load every requested look with one IN query and snapshot
+                    # the current association ids once, instead of a query and
+                    # a lazy-load per look
+                    looks = Look.query.options(load_only(Look.id, Look.name)).filter(Look.id.in_(look_ids)).all() if look_ids else []
+                    looks_by_id = {look.id: look for look in looks}
+                    existing_ids = {look.id for look in archetype.looks}
+
                     # Clear existing associations if specified
                     if clear_existing:
-                        print(f"Clearing existing looks for archetype {archetype.name}")
+                        app.logger.debug("Clearing existing looks for archetype %s", archetype.name)
                         archetype.looks = []
+                        existing_ids = set()
                         db.session.flush()  # Flush changes to DB without committing
-                    
+
                     # Add new associations
                     added_looks = []
                     for look_id in look_ids:
-                        look = Look.query.get(look_id)
+                        look = looks_by_id.get(look_id)
                         if not look:
-                            print(f"Look with ID {look_id} not found")
+                            app.logger.debug("Look with ID %s not found", look_id)
                             continue
-                            
+
                         # Check if look is already associated
-                        if not clear_existing and look in archetype.looks:
-                            print(f"Look {look.name} already associated with archetype {archetype.name}")
+                        if look.id in existing_ids:
+                            app.logger.debug("Look %s already associated with archetype %s", look.name, archetype.name)
                             continue
-                        
-                        print(f"Adding look {look.name} to archetype {archetype.name}")
+
+                        app.logger.debug("Adding look %s to archetype %s", look.name, archetype.name)
                         archetype.looks.append(look)
                         added_looks.append({
                             'id': look.id,
                             'name': look.name
                         })
-                    
-                    # Commit changes for this archetype
-                    db.session.commit()
-                    
+
+                    # Flush while the savepoint is open so a failed INSERT
+                    # surfaces here, inside the try, not at release time
+                    db.session.flush()
+                    # Release the savepoint; the batch commits once at the end
+                    savepoint.commit()
+
                     results['successful'].append({
                         'archetype_id': archetype_id,
                         'archetype_name': archetype.name,
@@ -643,27 +869,32 @@ def create_app(config_name='development'):
                         'cleared_existing': clear_existing,
                         'total_looks': len(archetype.looks)
                     })
-                    
+
                 except Exception as e:
-                    db.session.rollback()
-                    print(f"Error processing association: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+                    # Roll back only this association's savepoint so earlier
+                    # successes in the batch survive. No is_active check: a
+                    # failed flush deactivates the savepoint, and rolling it
+                    # back anyway is what restores the session to the state
+                    # before this item
+                    if savepoint is not None:
+                        savepoint.rollback()
+                    app.logger.exception("Error processing association")
                     results['failed'].append({
                         'association': association,
                         'error': str(e)
                     })
-            
+
+            # One network-bound COMMIT for the whole batch
+            db.session.commit()
+
             return jsonify({
                 'message': f"Processed {len(data)} associations",
                 'results': results
             }), 200
-            
+
         except Exception as e:
             db.session.rollback()
-            print(f"Error in bulk association: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            app.logger.exception("Error in bulk association")
             return jsonify({
                 'error': "Failed to process bulk associations",
                 'message': str(e)
@@ -676,29 +907,32 @@ def create_app(config_name='development'):
             category = request.args.get('category')
             makeup_category = request.args.get('makeup_category')
             
-            query = Look.query
+            # Core-level projection: plain rows in, plain dicts out, with no
+            # ORM hydration or per-look relationship loads
+            stmt = select(*LOOK_LIST_COLUMNS)
             
             if category:
-                query = query.filter_by(category=category.upper())
+                stmt = stmt.where(Look.category == category.upper())
             
             # Filter by makeup_category if provided
             if makeup_category:
-                # Use LIKE to match makeup_category within comma-separated values
-                query = query.filter(Look.makeup_category.like(f'%{makeup_category}%'))
+                # Exact member match within the JSON array (indexable with a
+                # multi-valued index if this filter gets hot)
+                stmt = stmt.where(func.json_contains(Look.makeup_category, json.dumps(makeup_category)) == 1)
             
-            looks = query.all()
-            return jsonify([look.to_dict() for look in looks]), 200
+            rows = db.session.execute(stmt).mappings().all()
+            return jsonify([look_row_to_dict(row) for row in rows]), 200
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
     @app.route('/looks/<int:look_id>', methods=['GET'])
     @jwt_required()
     def get_look(look_id):
-        look = Look.query.get(look_id)
-        if not look:
+        data = _look_dict(look_id)
+        if data is None:
             return jsonify({"error": "Look not found"}), 404
         
-        return jsonify(look.to_dict()), 200
+        return jsonify(data), 200
 
     @app.route('/looks', methods=['POST'])
     @jwt_required()
@@ -717,17 +951,9 @@ def create_app(config_name='development'):
         if artist_instruction_title and not artist_instruction:
             return jsonify({"error": "artist_instruction_title cannot exist without artist_instruction"}), 400
         
-        # Handle image_url as a list or a single string
-        image_url = data['image_url']
-        if isinstance(image_url, list):
-            # Convert list to comma-separated string
-            image_url = ','.join(image_url)
-        
-        # Handle makeup_category as a list or a single string
-        makeup_category = data.get('makeup_category')
-        if isinstance(makeup_category, list):
-            # Convert list to comma-separated string
-            makeup_category = ','.join(makeup_category)
+        # The multi-valued columns store JSON lists; normalize either shape
+        image_url = _as_list(data['image_url'])
+        makeup_category = _as_list(data.get('makeup_category'))
         
         # Create new look
         new_look = Look(
@@ -738,7 +964,7 @@ def create_app(config_name='development'):
             artist_instruction=artist_instruction,
             artist_instruction_title=artist_instruction_title,
             instructions=data.get('instructions'),
-            tags=','.join(data['tags']) if 'tags' in data and data['tags'] else None,
+            tags=_as_list(data.get('tags')),
             image_url=image_url,
             expertise_required=data.get('expertise_required'),
             application_time=data.get('application_time')
@@ -778,91 +1004,54 @@ def create_app(config_name='development'):
             if not artist_instruction:
                 return jsonify({"error": "artist_instruction_title cannot exist without artist_instruction"}), 400
         
-        # Update fields
-        if 'name' in data:
-            look.name = data['name']
-        if 'makeup_category' in data:
-            # Handle makeup_category as a list or a single string
-            makeup_category = data['makeup_category']
-            if isinstance(makeup_category, list):
-                # Convert list to comma-separated string
-                makeup_category = ','.join(makeup_category)
-            look.makeup_category = makeup_category
-        if 'author' in data:
-            look.author = data['author']
-        if 'artist_instruction' in data:
-            look.artist_instruction = data['artist_instruction']
-        if 'artist_instruction_title' in data:
-            look.artist_instruction_title = data['artist_instruction_title']
-        if 'instructions' in data:
-            look.instructions = data['instructions']
-        if 'tags' in data:
-            look.tags = ','.join(data['tags']) if data['tags'] else None
-        if 'image_url' in data:
-            # Handle image_url as a list or a single string
-            image_url = data['image_url']
-            if isinstance(image_url, list):
-                # Convert list to comma-separated string
-                image_url = ','.join(image_url)
-            look.image_url = image_url
-        if 'expertise_required' in data:
-            look.expertise_required = data['expertise_required']
-        if 'application_time' in data:
-            look.application_time = data['application_time']
+        # Update fields through the shared field table: one dict probe per
+        # field instead of a hand-written branch each
+        for field, normalize in _LOOK_UPDATABLE.items():
+            if field in data:
+                value = data[field]
+                setattr(look, field, normalize(value) if normalize else value)
         
-        # Update products if provided
+        # Update products if provided: one IN-query for all referenced ids
+        # instead of one SELECT each; unknown ids are dropped as before
         if 'product_ids' in data:
-            # Clear existing products
-            look.products = []
-            # Add new products
-            for product_id in data['product_ids']:
-                product = Product.query.get(product_id)
-                if product:
-                    look.products.append(product)
+            look.products = Product.query.options(load_only(Product.id)).filter(Product.id.in_(data['product_ids'])).all() if data['product_ids'] else []
         
-        # Update archetypes if provided
+        # Update archetypes if provided (same batched lookup)
         if 'archetype_ids' in data:
-            # Clear existing archetypes
-            look.archetypes = []
-            # Add new archetypes
-            for archetype_id in data['archetype_ids']:
-                archetype = Archetype.query.get(archetype_id)
-                if archetype:
-                    look.archetypes.append(archetype)
+            look.archetypes = Archetype.query.options(load_only(Archetype.id)).filter(Archetype.id.in_(data['archetype_ids'])).all() if data['archetype_ids'] else []
         
         db.session.commit()
         
-        return jsonify(look.to_dict()), 200
+        # Lean PUT response: echo the updatable scalars straight off the row.
+        # to_dict() would walk look.products and look.archetypes, re-firing a
+        # SELECT per relationship after the commit expired them
+        return jsonify({'id': look.id, **{field: getattr(look, field) for field in _LOOK_UPDATABLE}}), 200
 
     @app.route('/admin/looks/bulk', methods=['POST'])
-    @admin_required()
+    @admin_required
     def create_looks_bulk():
         try:
             # Get current user
             current_user_id = get_jwt_identity()
-            print(f"User ID attempting bulk upload: {current_user_id}")
+            app.logger.debug("User ID attempting bulk upload: %s", current_user_id)
             
-            # Find user by ID (not email)
-            user = User.query.get(current_user_id)
+            # Resolve the caller's email through the short-TTL cache
+            user_email = get_user_email(current_user_id)
             
-            if not user:
-                print(f"No user found with ID: {current_user_id}")
+            if not user_email:
+                app.logger.debug("No user found with ID: %s", current_user_id)
                 return jsonify({"error": "User not found"}), 404
             
-            print(f"User found: {user.email}, Admin status: {getattr(user, 'is_admin', False)}")
+            app.logger.debug("User found: %s", user_email)
             
-            # Get JSON data from request
-            data = request.get_json()
+            # Stream-parse the payload instead of materializing it: items are
+            # validated as they arrive and flushed in bounded batches, so peak
+            # memory stays at BULK_INSERT_BATCH_SIZE rows however large the
+            # upload is
+            created_count = 0
+            batch = []
             
-            if not data or not isinstance(data, list):
-                return jsonify({"error": "Invalid data format. Expected a list of looks"}), 400
-            
-            created_looks = []
-            
-            # Begin a transaction
-            db.session.begin_nested()
-            
-            for look_data in data:
+            for look_data in _stream_array_items(request.stream):
                 # Validate required fields
                 required_fields = ['name', 'category']  # Removed author
                 for field in required_fields:
@@ -877,51 +1066,49 @@ def create_app(config_name='development'):
                     db.session.rollback()
                     return jsonify({"error": f"artist_instruction_title cannot exist without artist_instruction for look '{look_data['name']}'"}), 400
                 
-                # Handle image_url as a list or a single string
-                image_url = look_data.get('image_url')
-                if isinstance(image_url, list):
-                    # Convert list to comma-separated string
-                    image_url = ','.join(image_url)
-                
-                # Handle makeup_category as a list or a single string
-                makeup_category = look_data.get('makeup_category')
-                if isinstance(makeup_category, list):
-                    # Convert list to comma-separated string
-                    makeup_category = ','.join(makeup_category)
+                # The multi-valued columns store JSON lists; normalize
+                # either shape
+                image_url = _as_list(look_data.get('image_url'))
+                makeup_category = _as_list(look_data.get('makeup_category'))
                 
-                # Create new look
-                new_look = Look(
-                    name=look_data['name'],
-                    category=look_data['category'],
-                    expertise_required=look_data.get('expertise_required'),
-                    application_time=look_data.get('application_time'),
-                    image_url=image_url,
-                    author=look_data.get('author'),
-                    artist_instruction=artist_instruction,
-                    artist_instruction_title=artist_instruction_title,
-                    instructions=look_data.get('instructions'),
-                    makeup_category=makeup_category
-                )
-                
-                db.session.add(new_look)
-                created_looks.append({
-                    'id': new_look.id,
-                    'name': new_look.name
+                batch.append({
+                    'name': look_data['name'],
+                    'category': look_data['category'],
+                    'expertise_required': look_data.get('expertise_required'),
+                    'application_time': look_data.get('application_time'),
+                    'image_url': image_url,
+                    'author': look_data.get('author'),
+                    'artist_instruction': artist_instruction,
+                    'artist_instruction_title': artist_instruction_title,
+                    'instructions': look_data.get('instructions'),
+                    'makeup_category': makeup_category
                 })
+                if len(batch) >= BULK_INSERT_BATCH_SIZE:
+                    db.session.execute(insert(Look), batch)
+                    created_count += len(batch)
+                    batch.clear()
+            
+            if batch:
+                db.session.execute(insert(Look), batch)
+                created_count += len(batch)
             
             # Commit the transaction
             db.session.commit()
-            
+            # Core inserts bypass the mapper events the caches hang off, so
+            # clear them explicitly
+            _invalidate_reference_caches(None, None, None)
+
             return jsonify({
-                "message": f"Successfully created {len(created_looks)} looks",
-                "looks": created_looks
+                "message": f"Successfully created {created_count} looks",
+                "created_count": created_count
             }), 201
             
+        except ijson.JSONError:
+            db.session.rollback()
+            return jsonify({"error": "Invalid data format. Expected a list of looks"}), 400
         except Exception as e:
             db.session.rollback()
-            print(f"Error in bulk upload: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            app.logger.exception("Error in bulk upload")
             return jsonify({
                 "error": "Failed to create looks in bulk",
                 "message": str(e)
@@ -956,94 +1143,111 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/products/bulk', methods=['POST'])
-    @admin_required()
+    @admin_required
     def create_products_bulk():
         try:
             # Get current user
             current_user_id = get_jwt_identity()
-            print(f"User ID attempting bulk product upload: {current_user_id}")
+            app.logger.debug("User ID attempting bulk product upload: %s", current_user_id)
             
-            # Find user by ID
-            user = User.query.get(current_user_id)
+            # Resolve the caller's email through the short-TTL cache
+            user_email = get_user_email(current_user_id)
             
-            if not user:
-                print(f"No user found with ID: {current_user_id}")
+            if not user_email:
+                app.logger.debug("No user found with ID: %s", current_user_id)
                 return jsonify({"error": "User not found"}), 404
             
-            print(f"User found: {user.email}")
-            
-            # Get JSON data from request
-            data = request.get_json()
-            
-            if not data or not isinstance(data, list):
-                return jsonify({"error": "Invalid data format. Expected a list of products"}), 400
-            
-            created_products = []
-            skipped_products = []
-            
-            # Begin a transaction
-            db.session.begin_nested()
-            
-            for product_data in data:
+            app.logger.debug("User found: %s", user_email)
+            
+            # Stream-parse the payload and flush in bounded batches; each
+            # batch checks existing names with one IN query before inserting
+            created_count = 0
+            skipped_count = 0
+            seen_names = set()
+            batch = []
+            
+            def flush_batch():
+                nonlocal created_count, skipped_count
+                if not batch:
+                    return
+                existing_names = {
+                    name for (name,) in
+                    db.session.query(Product.name).filter(Product.name.in_([row['name'] for row in batch]))
+                }
+                new_rows = [row for row in batch if row['name'] not in existing_names]
+                skipped_count += len(batch) - len(new_rows)
+                if new_rows:
+                    db.session.execute(insert(Product), new_rows)
+                    created_count += len(new_rows)
+                batch.clear()
+            
+            for product_data in _stream_array_items(request.stream):
                 # Validate required fields
                 if 'name' not in product_data or 'image_url' not in product_data:
                     db.session.rollback()
                     return jsonify({"error": "Missing required fields: name and image_url"}), 400
                 
-                # Check if product with this name already exists
-                existing_product = Product.query.filter_by(name=product_data['name']).first()
-                if existing_product:
-                    print(f"Product with name {product_data['name']} already exists")
-                    skipped_products.append({
-                        'id': existing_product.id,
-                        'name': existing_product.name,
-                        'image_url': existing_product.image_url
-                    })
+                # Dedupe within the payload
+                if product_data['name'] in seen_names:
+                    skipped_count += 1
                     continue
+                seen_names.add(product_data['name'])
                 
-                # Create new product
-                new_product = Product(
-                    name=product_data['name'],
-                    image_url=product_data['image_url']
-                )
-                
-                db.session.add(new_product)
-                created_products.append({
-                    'id': new_product.id,
-                    'name': new_product.name,
-                    'image_url': new_product.image_url
+                batch.append({
+                    'name': product_data['name'],
+                    'image_url': product_data['image_url']
                 })
+                if len(batch) >= BULK_INSERT_BATCH_SIZE:
+                    flush_batch()
+            
+            flush_batch()
             
             # Commit the transaction
             db.session.commit()
-            
+            # Core inserts bypass the mapper events the caches hang off, so
+            # clear them explicitly
+            _invalidate_reference_caches(None, None, None)
+
             return jsonify({
-                "message": f"Successfully created {len(created_products)} products, skipped {len(skipped_products)} existing products",
-                "created": created_products,
-                "skipped": skipped_products
+                "message": f"Successfully created {created_count} products, skipped {skipped_count} existing products",
+                "created_count": created_count,
+                "skipped_count": skipped_count
             }), 201
             
+        except ijson.JSONError:
+            db.session.rollback()
+            return jsonify({"error": "Invalid data format. Expected a list of products"}), 400
         except Exception as e:
             db.session.rollback()
-            print(f"Error in bulk product upload: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            app.logger.exception("Error in bulk product upload")
             return jsonify({
                 "error": "Failed to create products in bulk",
                 "message": str(e)
             }), 500
 
+    # /health ping cache: aggressive probes from balancers/orchestrators
+    # shouldn't each consume a pool connection, so only the first probe per
+    # second actually touches MySQL. Failures are never cached — recovery
+    # shows up on the very next probe
+    health_cache = {'ts': 0.0, 'db_status': None}
+
     @app.route('/health', methods=['GET'])
     def health_check():
-        db_status = "unknown"
-        try:
-            # Use text() here too
-            db.session.execute(text('SELECT 1'))
-            db_status = "healthy"
-            app.logger.info("Health check: Database connection successful")
-        except Exception as e:
-            db_status = "unhealthy"
-            app.logger.error(f"Health check: Database connection failed: {str(e)}")
+        now = time.monotonic()
+        if health_cache['db_status'] == 'healthy' and now - health_cache['ts'] < 1.0:
+            db_status = 'healthy'
+        else:
+            try:
+                # Use text() here too
+                db.session.execute(text('SELECT 1'))
+                db_status = "healthy"
+                health_cache['db_status'] = db_status
+                health_cache['ts'] = now
+                app.logger.info("Health check: Database connection successful")
+            except Exception as e:
+                db_status = "unhealthy"
+                health_cache['db_status'] = db_status
+                app.logger.error(f"Health check: Database connection failed: {str(e)}")
         
         response = {
             "status": "success",
@@ -1057,28 +1261,34 @@ def create_app(config_name='development'):
 
     @app.before_request
     def log_request_info():
-        # Store the start time for request duration calculation
-        request.start_time = time.time()
-        app.logger.info(f"Request started: {request.method} {request.path}")
+        # Store the start time for request duration calculation on g;
+        # perf_counter is monotonic, so NTP slews can't produce negative
+        # or inflated durations the way time.time() could
+        g.start_time = time.perf_counter()
+        app.logger.info("Request started: %s %s", request.method, request.path)
 
     @app.after_request
     def log_response_info(response):
         # Calculate request duration
-        duration = time.time() - request.start_time
-        app.logger.info(f"Request completed: {request.method} {request.path} - Status: {response.status_code} - Duration: {duration:.4f}s")
+        duration = time.perf_counter() - g.start_time
+        app.logger.info("Request completed: %s %s - Status: %s - Duration: %.4fs",
+                        request.method, request.path, response.status_code, duration)
         return response
 
     @app.errorhandler(Exception)
     def handle_exception(e):
-        # Get the full traceback
-        tb = traceback.format_exc()
-        app.logger.error(f"Unhandled exception: {str(e)}\n{tb}")
+        # logger.exception defers traceback formatting to the handler, so
+        # nothing walks the stack frames unless the record is actually emitted
+        app.logger.exception("Unhandled exception: %s", e)
         
-        return jsonify({
+        response = {
             "status": "error",
-            "message": "Internal server error",
-            "details": str(e)
-        }), 500
+            "message": "Internal server error"
+        }
+        # Exception details only leave the process in debug mode
+        if app.debug:
+            response["details"] = str(e)
+        return jsonify(response), 500
 
     @app.route('/', methods=['GET'])
     def root():
@@ -1106,13 +1316,13 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/check', methods=['GET'])
-    @admin_required()
+    @admin_required
     def admin_check():
         """Simple endpoint to verify admin access"""
         return jsonify({"status": "success", "message": "Admin access confirmed"}), 200
 
     @app.route('/admin/archetypes/<int:archetype_id>', methods=['DELETE'])
-    @admin_required()
+    @admin_required
     def delete_archetype(archetype_id):
         try:
             archetype = Archetype.query.get_or_404(archetype_id)
@@ -1129,7 +1339,7 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/looks/<int:look_id>', methods=['DELETE'])
-    @admin_required()
+    @admin_required
     def delete_look(look_id):
         try:
             look = Look.query.get_or_404(look_id)
@@ -1146,7 +1356,7 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/products/<int:product_id>', methods=['DELETE'])
-    @admin_required()
+    @admin_required
     def delete_product(product_id):
         try:
             product = Product.query.get_or_404(product_id)
@@ -1163,17 +1373,24 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/archetypes/<int:archetype_id>/associations', methods=['GET'])
-    @admin_required()
+    @admin_required
     def get_archetype_associations(archetype_id):
         try:
-            archetype = Archetype.query.get_or_404(archetype_id)
+            archetype = Archetype.query.options(selectinload(Archetype.looks)).get_or_404(archetype_id)
+            # Fetch this archetype's association rows once and key them by
+            # look id; the old per-look Query.get call passed kwargs, which
+            # raises, so this path failed on every request with associations
+            assoc_by_look = {
+                a.look_id: a
+                for a in ArchetypeLookAssociation.query.filter_by(archetype_id=archetype_id).all()
+            }
             associations = []
             for look in archetype.looks:
-                assoc = ArchetypeLookAssociation.query.get(look_id=look.id, archetype_id=archetype.id).first()
+                assoc = assoc_by_look.get(look.id)
                 associations.append({
                     'look_id': look.id,
                     'look_name': look.name,
-                    'look_category': assoc.category,
+                    'look_category': assoc.category if assoc else None,
                     'look_image_url': look.image_url
                 })
             
@@ -1190,19 +1407,24 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/archetypes/<int:archetype_id>/looks/<int:look_id>', methods=['DELETE'])
-    @admin_required()
+    @admin_required
     def delete_archetype_look_association(archetype_id, look_id):
         try:
-            archetype = Archetype.query.get_or_404(archetype_id)
-            look = Look.query.get_or_404(look_id)
+            # Probe the association row directly instead of loading both
+            # parents and the full looks collection for an 'in' check; the
+            # unique (archetype_id, look_id) constraint makes this an index
+            # lookup
+            association = ArchetypeLookAssociation.query.filter_by(
+                archetype_id=archetype_id, look_id=look_id
+            ).first()
             
-            if look not in archetype.looks:
+            if association is None:
                 return jsonify({
                     'error': 'Association not found',
                     'message': f'Look {look_id} is not associated with Archetype {archetype_id}'
                 }), 404
             
-            archetype.looks.remove(look)
+            db.session.delete(association)
             db.session.commit()
             
             return jsonify({
@@ -1216,10 +1438,15 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/looks/<int:look_id>/associations', methods=['GET'])
-    @admin_required()
+    @admin_required
     def get_look_associations(look_id):
         try:
-            look = Look.query.get_or_404(look_id)
+            # Eager-load both collections so serializing them doesn't fire
+            # lazy-load SELECTs
+            look = Look.query.options(
+                selectinload(Look.archetypes),
+                selectinload(Look.products)
+            ).get_or_404(look_id)
             
             archetype_associations = [{
                 'archetype_id': archetype.id,
@@ -1252,19 +1479,22 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/looks/<int:look_id>/products/<int:product_id>', methods=['DELETE'])
-    @admin_required()
+    @admin_required
     def delete_look_product_association(look_id, product_id):
         try:
-            look = Look.query.get_or_404(look_id)
-            product = Product.query.get_or_404(product_id)
+            # Same direct probe as the archetype-look delete: one indexed
+            # SELECT instead of two parent loads plus a collection scan
+            association = LookProductAssociation.query.filter_by(
+                look_id=look_id, product_id=product_id
+            ).first()
             
-            if product not in look.products:
+            if association is None:
                 return jsonify({
                     'error': 'Association not found',
                     'message': f'Product {product_id} is not associated with Look {look_id}'
                 }), 404
             
-            look.products.remove(product)
+            db.session.delete(association)
             db.session.commit()
             
             return jsonify({
@@ -1278,21 +1508,24 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/associations', methods=['GET'])
-    @admin_required()
+    @admin_required
     def get_all_associations():
         try:
-            # Get all archetypes with their looks
-            archetypes = Archetype.query.all()
+            # Get all archetypes with their looks; selectinload pulls each
+            # collection in one IN-query instead of one lazy SELECT per parent
+            archetypes = Archetype.query.options(selectinload(Archetype.looks)).all()
+            # Association categories fetched once and keyed by (archetype, look)
+            categories = {
+                (assoc.archetype_id, assoc.look_id): assoc.category
+                for assoc in ArchetypeLookAssociation.query.all()
+            }
             archetype_associations = []
             for archetype in archetypes:
-                looks = []
-                for look in archetype.looks:
-                    assoc = ArchetypeLookAssociation.query.get(archetype_id=archetype.id, look_id=look.id).first()
-                    look.appen({
-                        'look_id': look.id,
-                        'look_name': look.name,
-                        'category': assoc.category
-                    })
+                looks = [{
+                    'look_id': look.id,
+                    'look_name': look.name,
+                    'category': categories.get((archetype.id, look.id))
+                } for look in archetype.looks]
                 
                 archetype_associations.append({
                     'archetype_id': archetype.id,
@@ -1301,7 +1534,7 @@ def create_app(config_name='development'):
                 })
 
             # Get all looks with their products
-            looks = Look.query.all()
+            looks = Look.query.options(selectinload(Look.products)).all()
             look_product_associations = [{
                 'look_id': look.id,
                 'look_name': look.name,
@@ -1329,7 +1562,7 @@ def create_app(config_name='development'):
             }), 500
 
     @app.route('/admin/looks/bulk-associate-products', methods=['POST'])
-    @admin_required()
+    @admin_required
     def bulk_associate_looks_products():
         try:
             data = request.get_json()
@@ -1345,7 +1578,17 @@ def create_app(config_name='development'):
                 'failed': []
             }
             
+            # Pre-fetch every referenced look and product with two IN-queries;
+            # the loop below then resolves ids from dicts instead of issuing
+            # one SELECT per id
+            look_ids = [a['look_id'] for a in data if isinstance(a, dict) and 'look_id' in a]
+            all_product_ids = {pid for a in data if isinstance(a, dict)
+                               for pid in a.get('product_ids', [])}
+            looks_by_id = {look.id: look for look in Look.query.options(load_only(Look.id, Look.name)).filter(Look.id.in_(look_ids)).all()} if look_ids else {}
+            products_by_id = {p.id: p for p in Product.query.options(load_only(Product.id, Product.name)).filter(Product.id.in_(all_product_ids)).all()} if all_product_ids else {}
+            
             for association in data:
+                savepoint = None
                 try:
                     if 'look_id' not in association or 'product_ids' not in association:
                         results['failed'].append({
@@ -1358,7 +1601,7 @@ def create_app(config_name='development'):
                     product_ids = association['product_ids']
                     clear_existing = association.get('clear_existing', False)
                     
-                    look = Look.query.get(look_id)
+                    look = looks_by_id.get(look_id)
                     if not look:
                         results['failed'].append({
                             'association': association,
@@ -1366,37 +1609,48 @@ def create_app(config_name='development'):
                         })
                         continue
                     
-                    # Get current product associations
-                    current_products = list(look.products)
+                    # Each association runs inside a SAVEPOINT so one failure
+                    # doesn't discard the rest of the batch
+                    savepoint = db.session.begin_nested()
+                    
+                    # Snapshot the current association ids once; membership
+                    # tests against the set are O(1) instead of re-scanning
+                    # (and re-lazy-loading) look.products per candidate
+                    existing_ids = {p.id for p in look.products}
                     
                     # Clear existing associations if specified
                     if clear_existing:
-                        print(f"Clearing existing products for look {look.name}")
+                        app.logger.debug("Clearing existing products for look %s", look.name)
                         look.products = []
+                        existing_ids = set()
                         db.session.flush()  # Flush changes to DB without committing
                     
                     # Add new associations
                     added_products = []
                     for product_id in product_ids:
-                        product = Product.query.get(product_id)
+                        product = products_by_id.get(product_id)
                         if not product:
-                            print(f"Product with ID {product_id} not found")
+                            app.logger.debug("Product with ID %s not found", product_id)
                             continue
                             
                         # Check if product is already associated
-                        if not clear_existing and product in look.products:
-                            print(f"Product {product.name} already associated with look {look.name}")
+                        if product.id in existing_ids:
+                            app.logger.debug("Product %s already associated with look %s", product.name, look.name)
                             continue
                         
-                        print(f"Adding product {product.name} to look {look.name}")
+                        app.logger.debug("Adding product %s to look %s", product.name, look.name)
                         look.products.append(product)
+                        existing_ids.add(product.id)
                         added_products.append({
                             'id': product.id,
                             'name': product.name
                         })
-                    
-                    # Commit changes for this look
-                    db.session.commit()
+
+                    # Flush while the savepoint is open so a failed INSERT
+                    # surfaces here, inside the try, not at release time
+                    db.session.flush()
+                    # Release the savepoint; the batch commits once at the end
+                    savepoint.commit()
                     
                     results['successful'].append({
                         'look_id': look_id,
@@ -1405,17 +1659,24 @@ def create_app(config_name='development'):
                         'cleared_existing': clear_existing,
                         'total_products': len(look.products)
                     })
-                    
+
                 except Exception as e:
-                    db.session.rollback()
-                    print(f"Error processing association: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+                    # Roll back only this association's savepoint so earlier
+                    # successes in the batch survive. No is_active check: a
+                    # failed flush deactivates the savepoint, and rolling it
+                    # back anyway is what restores the session to the state
+                    # before this item
+                    if savepoint is not None:
+                        savepoint.rollback()
+                    app.logger.exception("Error processing association")
                     results['failed'].append({
                         'association': association,
                         'error': str(e)
                     })
             
+            # One network-bound COMMIT for the whole batch
+            db.session.commit()
+            
             return jsonify({
                 'message': f"Processed {len(data)} associations",
                 'results': results
@@ -1423,9 +1684,7 @@ def create_app(config_name='development'):
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error in bulk association: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            app.logger.exception("Error in bulk association")
             return jsonify({
                 'error': "Failed to process bulk associations",
                 'message': str(e)
@@ -21,16 +21,24 @@ class Config:
         MYSQL_DB = os.getenv('MYSQLDATABASE', 'narsbeauty')
         SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}'
     
-    # Add connection pooling for stability
+    # Add connection pooling for stability; each gunicorn worker gets its
+    # own pool, so size it to the threads per worker (GUNICORN_THREADS),
+    # not the total process count
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_size': 5,
-        'pool_recycle': 280,  # Recycle connections before MySQL's default timeout
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'pool_recycle': 240,  # Recycle connections safely below MySQL's wait_timeout
         'pool_pre_ping': True,  # Verify connections before using them
-        'max_overflow': 10
+        'pool_use_lifo': True,  # Reuse the hottest connections; idle ones age out
+        'pool_timeout': 30,  # Fail fast instead of queueing forever when exhausted
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10))
     }
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Bcrypt cost factor (2^n key-schedule rounds); tune via env to trade
+    # login latency against hash strength
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+
     # JWT Configuration
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', '8wkfDfzZdBLLfccIyBSgM7zcdUXokA8H3zNSho3zMNU=')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))  # 1 hour
@@ -53,10 +61,14 @@ class ProductionConfig(Config):
     DEBUG = False
     # In production, we should be more strict about security
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_size': 10,
-        'pool_recycle': 280,
+        # Default matches start.sh's GUNICORN_THREADS so every thread can
+        # hold a connection without churning overflow connections
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 8)),
+        'pool_recycle': 240,
         'pool_pre_ping': True,
-        'max_overflow': 20,
+        'pool_use_lifo': True,
+        'pool_timeout': 30,
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 4)),
         'connect_args': {
             'connect_timeout': 10,
             'read_timeout': 30,
@@ -1,15 +1,17 @@
 from app import create_app, db
 from models import User
 import bcrypt
+import os
 
 def create_admin_user():
-    app = create_app('production')
+    app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
     with app.app_context():
-        # Check if admin already exists
+        # Check if admin already exists (id-only probe; no need to pull the
+        # full row just to test existence)
         admin_email = 'admin@narspersona.com'
-        admin = User.query.filter_by(email=admin_email).first()
-        
-        if admin:
+        exists = db.session.query(User.id).filter_by(email=admin_email).first() is not None
+
+        if exists:
             print(f"Admin user {admin_email} already exists")
             return
         
@@ -18,7 +20,15 @@ def create_admin_user():
         
         # Create the user
         admin = User(email=admin_email)
-        admin.password = bcrypt.hashpw(admin_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        # In dev/test a precomputed hash skips the (deliberately slow) bcrypt
+        # work on every reseed; production always hashes live
+        dev_hash = os.environ.get('DEV_ADMIN_BCRYPT_HASH')
+        if dev_hash and app.debug:
+            admin.password = dev_hash
+        else:
+            # Honor the configured cost factor instead of bcrypt's default
+            rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+            admin.password = bcrypt.hashpw(admin_password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
         
         # Add and commit to database
         db.session.add(admin)
@@ -1,13 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
 from models import User
 from extensions import db
 from extensions import bcrypt
 from typing import List, Dict
 
+# Guarded query helper: relationships not named in `eager` raise on access
+# instead of silently lazy-loading, so a dropped selectinload shows up as an
+# error in development rather than as an N+1 regression in production
+def safe_query(model, *eager):
+    return model.query.options(*[selectinload(rel) for rel in eager], raiseload('*'))
+
 # Get user by email
 def get_user_by_email(email):
     return User.query.filter_by(email=email).first()
 
+# Auth-path lookup: only id and password hash leave the database — the
+# other columns never matter for a credential check
+def get_user_for_auth(email):
+    return User.query.options(load_only(User.id, User.password)).filter_by(email=email).first()
+
 # Create user
 def create_user(email, password):
     user = User(email=email, password=password)
@@ -17,7 +28,7 @@ def create_user(email, password):
 
 # Verify password
 def verify_password(db: Session, email: str, password: str):
-    user = get_user_by_email(email)
+    user = get_user_for_auth(email)
     return user and bcrypt.check_password_hash(user.password, password)
 
 def update_user_password(db: Session, email: str, new_password: str):
@@ -1,8 +1,10 @@
 import os
-import json
-import random
+import orjson
+import sys
 import string
 import mysql.connector
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Database Connection Config (Change this to your actual credentials)
@@ -16,68 +18,85 @@ DB_CONFIG = {
 # Output Folder
 MOCK_FOLDER = 'mocks'
 
-# Helper to generate random data
-def random_string(length=10):
-    return ''.join(random.choices(string.ascii_letters, k=length))
+# Helpers generate a whole column at a time: one vectorized NumPy call per
+# column instead of a Python-level random call per cell
+_rng = np.random.default_rng()
+_LETTERS = np.array(list(string.ascii_letters))
+_LOWER = np.array(list(string.ascii_lowercase))
 
-def random_date():
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime.now()
-    return start_date + (end_date - start_date) * random.random()
-
-def random_int(min_val=1, max_val=100):
-    return random.randint(min_val, max_val)
+def string_column(row_count, length=10):
+    # (row_count, length) char matrix reinterpreted as fixed-width strings —
+    # the whole column materializes without a single Python-level join
+    return _rng.choice(_LETTERS, size=(row_count, length)).view(f'U{length}').ravel().tolist()
 
-def random_email():
-    return f"{random_string(5).lower()}@example.com"
-
-# Column type to mock value mapper
-def mock_value(column):
+def date_column(row_count):
+    start_date = datetime(2023, 1, 1)
+    span = datetime.now() - start_date
+    return [(start_date + span * offset).strftime('%Y-%m-%d %H:%M:%S')
+            for offset in _rng.random(row_count)]
+
+def int_column(row_count, min_val=1, max_val=100):
+    return _rng.integers(min_val, max_val + 1, size=row_count).tolist()
+
+def email_column(row_count):
+    locals_ = _rng.choice(_LOWER, size=(row_count, 5)).view('U5').ravel()
+    return [f"{local}@example.com" for local in locals_]
+
+def float_column(row_count):
+    return _rng.uniform(1, 100, size=row_count).round(2).tolist()
+
+# Column type to mock column generator, resolved once per column — each
+# generator emits the full column in one shot. Field-name heuristics
+# (email/id) come first; in the old per-cell chain they sat behind the
+# type checks and never matched
+def column_generator(column):
+    field = column['Field'].lower()
     col_type = column['Type'].lower()
 
+    if 'email' in field:
+        return email_column
     if 'int' in col_type:
-        return random_int()
-    elif 'varchar' in col_type or 'text' in col_type:
-        return random_string(12)
-    elif 'date' in col_type or 'timestamp' in col_type or 'datetime' in col_type:
-        return random_date().strftime('%Y-%m-%d %H:%M:%S')
-    elif 'float' in col_type or 'double' in col_type or 'decimal' in col_type:
-        return round(random.uniform(1, 100), 2)
-    elif 'email' in column['Field'].lower():
-        return random_email()
-    elif 'id' in column['Field'].lower():
-        return random_int(1, 9999)
-    else:
-        return random_string(8)
+        if 'id' in field:
+            return lambda n: int_column(n, 1, 9999)
+        return int_column
+    if 'varchar' in col_type or 'text' in col_type:
+        return lambda n: string_column(n, 12)
+    if 'date' in col_type or 'timestamp' in col_type or 'datetime' in col_type:
+        return date_column
+    if 'float' in col_type or 'double' in col_type or 'decimal' in col_type:
+        return float_column
+    return lambda n: string_column(n, 8)
 
 # Create /mocks directory if not exists
 os.makedirs(MOCK_FOLDER, exist_ok=True)
 
-def fetch_tables(cursor):
-    cursor.execute("SHOW TABLES")
-    return [table[0] for table in cursor.fetchall()]
-
-def fetch_columns(cursor, table_name):
-    cursor.execute(f"DESCRIBE {table_name}")
-    columns = []
-    for column in cursor.fetchall():
-        columns.append({
-            'Field': column[0],
-            'Type': column[1]
+def fetch_schema(cursor, schema):
+    """Fetch every table's columns with one information_schema query
+    instead of a DESCRIBE round-trip per table."""
+    cursor.execute(
+        "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE "
+        "FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = %s "
+        "ORDER BY TABLE_NAME, ORDINAL_POSITION",
+        (schema,)
+    )
+    schema_map = {}
+    for table_name, column_name, column_type in cursor.fetchall():
+        schema_map.setdefault(table_name, []).append({
+            'Field': column_name,
+            'Type': column_type
         })
-    return columns
+    return schema_map
 
 def generate_mock_data(table_name, columns, row_count=5):
-    mock_data = []
-    for _ in range(row_count):
-        row = {}
-        for column in columns:
-            row[column['Field']] = mock_value(column)
-        mock_data.append(row)
-    return mock_data
+    # Generate column-wise, then zip the columns back into row dicts
+    fields = [column['Field'] for column in columns]
+    column_values = [column_generator(column)(row_count) for column in columns]
+    return [dict(zip(fields, row)) for row in zip(*column_values)]
 
 def write_mock_file(table_name, mock_data):
-    file_content = f"""const mock{table_name.capitalize()} = {json.dumps(mock_data, indent=2)};
+    rendered = orjson.dumps(mock_data, option=orjson.OPT_INDENT_2).decode()
+    file_content = f"""const mock{table_name.capitalize()} = {rendered};
 
 export default mock{table_name.capitalize()};
 """
@@ -85,22 +104,55 @@ export default mock{table_name.capitalize()};
     with open(file_path, 'w', encoding='utf-8') as file:
         file.write(file_content)
 
-def main():
+def insert_mock_rows(cursor, table_name, mock_data, chunk_size=1000):
+    """Seed the generated rows with one multi-row INSERT per chunk
+    instead of a statement (and round-trip) per row."""
+    if not mock_data:
+        return
+    fields = list(mock_data[0])
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = f"INSERT INTO {table_name} ({', '.join(fields)}) VALUES ({placeholders})"
+    rows = [tuple(row[field] for field in fields) for row in mock_data]
+    for start in range(0, len(rows), chunk_size):
+        cursor.executemany(sql, rows[start:start + chunk_size])
+
+def main(seed=False, row_count=5):
     connection = mysql.connector.connect(**DB_CONFIG)
     cursor = connection.cursor()
 
-    tables = fetch_tables(cursor)
-    print(f"Found tables: {tables}")
+    schema_map = fetch_schema(cursor, DB_CONFIG['database'])
+    print(f"Found tables: {list(schema_map)}")
 
-    for table in tables:
-        columns = fetch_columns(cursor, table)
-        mock_data = generate_mock_data(table, columns)
-        write_mock_file(table, mock_data)
+    mock_sets = {
+        table: generate_mock_data(table, columns, row_count)
+        for table, columns in schema_map.items()
+    }
+
+    # File writes are I/O-bound; fan them out across a small thread pool
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pool.map(lambda item: write_mock_file(*item), mock_sets.items())
+
+    if seed:
+        # Mock FK values are random ints with no real parent rows, and the
+        # tables come back in information_schema order (association tables
+        # before their parents) — disable FK checks around the seed, same
+        # as reset_db.py does for truncation
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+
+    for table, mock_data in mock_sets.items():
         print(f"Generated mock for table: {table}")
+        if seed:
+            insert_mock_rows(cursor, table, mock_data)
+            print(f"Seeded {len(mock_data)} rows into table: {table}")
+
+    if seed:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        connection.commit()
 
     cursor.close()
     connection.close()
     print(f"✅ All mock files saved in: {MOCK_FOLDER}/")
 
 if __name__ == '__main__':
-    main()
+    # Pass --seed to also insert the generated rows into the database
+    main(seed='--seed' in sys.argv)
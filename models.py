@@ -1,9 +1,8 @@
 from extensions import db, bcrypt
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import JSON
-from werkzeug.security import generate_password_hash, check_password_hash
-import json
-import uuid
+from sqlalchemy.orm import selectinload
+import hashlib
+import secrets
 
 # User Model
 class User(db.Model):
@@ -12,9 +11,20 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(256))
-    remember_token = db.Column(db.String(100), unique=True, nullable=True)
+    # Only a digest of the remember token is stored; a DB leak doesn't hand
+    # out usable session tokens, and the lookup stays index-bound. BINARY
+    # rather than LargeBinary: MySQL maps the latter to BLOB, which can't be
+    # indexed without a prefix length — a SHA-256 digest is fixed-width anyway
+    remember_token_hash = db.Column(db.BINARY(32), nullable=True)
     last_login = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Lazy by default: no endpoint serializes a user's feedback today, and
+    # an eager strategy here would tax every auth-path User fetch. Callers
+    # that need the collection opt in with selectinload at the query site
+    feedbacks = db.relationship('Feedback', back_populates='user')
+
+    __table_args__ = (db.Index('ix_users_email_token_hash', 'email', 'remember_token_hash'),)
+
     def __init__(self, **kwargs):
         super(User, self).__init__(**kwargs)
 
@@ -24,9 +34,14 @@ class User(db.Model):
     def check_password(self, password):
         return bcrypt.check_password_hash(self.password, password)
 
+    def set_remember_token(self, token):
+        """Store only the SHA-256 digest of the remember token."""
+        self.remember_token_hash = hashlib.sha256(token.encode('utf-8')).digest() if token else None
+
     def generate_remember_token(self):
-        self.remember_token = bcrypt.generate_password_hash(str(datetime.utcnow())).decode('utf-8')
-        return self.remember_token
+        token = secrets.token_hex(32)
+        self.set_remember_token(token)
+        return token
 
     def to_dict(self):
         """Convert the object to a dictionary."""
@@ -38,26 +53,42 @@ class User(db.Model):
 class Consultation(db.Model):
     __tablename__ = 'consultations'
     
+    # Deliberately autoincrement rather than UUID: MySQL 8's default
+    # interleaved autoinc lock mode (innodb_autoinc_lock_mode=2) doesn't
+    # serialize concurrent inserts, and integer ids are baked into the
+    # route converters and FKs throughout the API
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    answers_json = db.Column(db.Text, nullable=False)  # Store answers as JSON string
-    result_json = db.Column(db.Text, nullable=False)  # Store result as JSON string
+    # Native JSON columns: the driver decodes them in C, so the app layer
+    # no longer parses/serializes these per row
+    answers_json = db.Column(db.JSON, nullable=False)
+    result_json = db.Column(db.JSON, nullable=False)
     status = db.Column(db.String(20), default='completed')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
+    # One-to-one; lazy by default so the consultations list query doesn't
+    # pay a LEFT JOIN for a field it never serializes. Use joinedload at
+    # the call site when a consultation is fetched with its feedback
+    feedback = db.relationship('Feedback', back_populates='consultation',
+                               uselist=False)
+
+    # Compound index matching the list query (filter by user, newest first):
+    # the scan stays inside the user's partition and needs no sort step
+    __table_args__ = (db.Index('ix_cons_user_created', 'user_id', db.text('created_at DESC')),)
+
     def __init__(self, user_id, answers, result, status='completed'):
         self.user_id = user_id
-        self.answers_json = json.dumps(answers)  # Convert dict to JSON string
-        self.result_json = json.dumps(result)    # Convert dict to JSON string
+        self.answers_json = answers
+        self.result_json = result
         self.status = status
     
     @property
     def answers(self):
-        return json.loads(self.answers_json)
+        return self.answers_json
     
     @property
     def result(self):
-        return json.loads(self.result_json)
+        return self.result_json
     
     def to_dict(self):
         return {
@@ -80,8 +111,14 @@ class Feedback(db.Model):
     notes = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    user = db.relationship('User', backref=db.backref('feedbacks', lazy=True))
-    consultation = db.relationship('Consultation', backref=db.backref('feedback', uselist=False))
+    # Explicit back_populates instead of backrefs: the loading strategy for
+    # each direction lives on the side that owns it
+    user = db.relationship('User', back_populates='feedbacks')
+    consultation = db.relationship('Consultation', back_populates='feedback')
+
+    # "recent feedback by user" listings filter on user_id and sort on
+    # created_at; the compound index serves both (and plain user_id joins)
+    __table_args__ = (db.Index('ix_feedback_user_created', 'user_id', 'created_at'),)
 
     def to_dict(self):
         return {
@@ -100,34 +137,39 @@ class Look(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), nullable=False)
-    makeup_category = db.Column(db.String(100), nullable=True)  # Store multiple categories ('labbra,occhi,fondo') as comma-separated string
+    category = db.Column(db.String(50), nullable=True)  # 'MORNING', 'EVENING', 'SPECIAL_OCCASION'
+    makeup_category = db.Column(db.JSON, nullable=True)  # List of categories, e.g. ['labbra', 'occhi', 'fondo']
     author = db.Column(db.String(100), nullable=True)
     artist_instruction = db.Column(db.Text, nullable=True)  # Optional
     artist_instruction_title = db.Column(db.String(200), nullable=True)  # Optional, can't exist without artist_instruction
-    instructions = db.Column(JSON, nullable=True)  # Store step-by-step instructions as JSON
-    tags = db.Column(db.String(255), nullable=True)  # Comma-separated tags
-    # Keep as string but make it longer to accommodate multiple URLs
-    image_url = db.Column(db.String(2000), nullable=False)  # Store multiple URLs as comma-separated string
+    instructions = db.Column(db.JSON, nullable=True)  # Store step-by-step instructions as JSON
+    tags = db.Column(db.JSON, nullable=True)  # List of tags
+    image_url = db.Column(db.JSON, nullable=False)  # List of image URLs
     expertise_required = db.Column(db.String(20), nullable=True)  # Optional
     application_time = db.Column(db.Integer, nullable=True)  # Optional
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Multi-valued index over the JSON category array so the makeup_category
+    # filter in /looks is index-assisted (MySQL 8.0.17+)
+    __table_args__ = (
+        db.Index('ix_looks_makeup_category', db.text('(CAST(makeup_category AS CHAR(32) ARRAY))')),
+    )
     
     # Relationships
     archetypes = db.relationship('Archetype', secondary='archetype_look_association', back_populates='looks')
     products = db.relationship('Product', secondary='look_product_association', back_populates='looks')
     
-    @property
-    def product_count(self):
-        """Return the number of products associated with this look"""
-        return len(self.products)
-    
+    @classmethod
+    def query_with_products(cls):
+        """Query with the products collection eager-loaded; to_dict walks it,
+        so callers serializing many looks avoid one lazy SELECT per row"""
+        return cls.query.options(selectinload(cls.products))
+
     @property
     def image_urls(self):
-        """Parse the comma-separated image_url string into a list"""
-        if not self.image_url:
-            return []
-        return [url.strip() for url in self.image_url.split(',')]
+        """Image URLs as a list (the column stores JSON natively)"""
+        return self.image_url or []
     
     @property
     def cover_image(self):
@@ -137,29 +179,33 @@ class Look(db.Model):
     
     @property
     def makeup_categories(self):
-        """Parse the comma-separated makeup_category string into a list"""
-        if not self.makeup_category:
-            return []
-        return [category.strip() for category in self.makeup_category.split(',')]
+        """Makeup categories as a list (the column stores JSON natively)"""
+        return self.makeup_category or []
     
     def to_dict(self):
+        # Evaluate the derived values once per call instead of re-reading
+        # the properties (cover_image would re-walk image_urls, and
+        # product_count would re-touch the collection)
+        urls = self.image_urls
+        products = [product.to_dict() for product in self.products]
         return {
             'id': self.id,
             'name': self.name,
+            'category': self.category,
             'makeup_category': self.makeup_categories,  # Return as list
             'author': self.author,
             'artist_instruction': self.artist_instruction,
             'artist_instruction_title': self.artist_instruction_title,
             'instructions': self.instructions,
-            'tags': self.tags.split(',') if self.tags else [],
-            'image_url': self.image_urls,  # Return as list
-            'cover_image': self.cover_image,
+            'tags': self.tags or [],
+            'image_url': urls,  # Return as list
+            'cover_image': urls[0] if urls else None,
             'expertise_required': self.expertise_required,
             'application_time': self.application_time,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'products': [product.to_dict() for product in self.products],
-            'product_count': self.product_count
+            'products': products,
+            'product_count': len(products)
         }
 
 # Add the association table
@@ -168,7 +214,9 @@ class ArchetypeLookAssociation(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     archetype_id = db.Column(db.Integer, db.ForeignKey('archetypes.id'), nullable=False)
-    look_id = db.Column(db.Integer, db.ForeignKey('looks.id'), nullable=False)
+    # archetype_id is covered as the unique constraint's leading column;
+    # look_id needs its own index for the look -> archetypes join direction
+    look_id = db.Column(db.Integer, db.ForeignKey('looks.id'), nullable=False, index=True)
     category = db.Column(db.String(20), nullable=False)  # 'MORNING', 'EVENING', 'SPECIAL_OCCASION'
     
     __table_args__ = (db.UniqueConstraint('archetype_id', 'look_id'),)
@@ -185,6 +233,12 @@ class Archetype(db.Model):
     # Add this relationship
     looks = db.relationship('Look', secondary='archetype_look_association', back_populates='archetypes')
 
+    @classmethod
+    def query_full(cls):
+        """Query with looks and their products eager-loaded; to_dict
+        serializes the whole tree, so this caps the query count at three"""
+        return cls.query.options(selectinload(cls.looks).selectinload(Look.products))
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -220,8 +274,22 @@ class LookProductAssociation(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     look_id = db.Column(db.Integer, db.ForeignKey('looks.id'), nullable=False)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
-    
+    # look_id is covered as the unique constraint's leading column; product_id
+    # needs its own index for the product -> looks join direction
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
+
     __table_args__ = (db.UniqueConstraint('look_id', 'product_id'),)
 
+# Count products in SQL instead of loading the collection just to len() it.
+# Deferred so plain look queries don't pay the subquery; count-only callers
+# undefer it. Defined here because the association model comes after Look.
+# to_dict keeps len(self.products) — there the collection is loaded anyway.
+Look.product_count = db.column_property(
+    db.select(db.func.count(LookProductAssociation.product_id))
+    .where(LookProductAssociation.look_id == Look.id)
+    .correlate_except(LookProductAssociation)
+    .scalar_subquery(),
+    deferred=True,
+)
+
 
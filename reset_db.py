@@ -3,7 +3,7 @@ import os
 import sys
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 
 # Import your app and db from wherever they are defined
 sys.path.append("/app")
@@ -15,19 +15,34 @@ def reset_database():
         conn = db.engine.connect()
         
         try:
-            # Disable foreign key checks temporarily
-            conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
+            existing_tables = set(inspect(db.engine).get_table_names())
+            expected_tables = set(db.metadata.tables)
             
-            # Drop all tables
-            print("Dropping all tables...")
-            db.drop_all()
-            
-            # Re-enable foreign key checks
-            conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
-            
-            # Create all tables from scratch
-            print("Creating all tables...")
-            db.create_all()
+            if existing_tables == expected_tables:
+                # Schema already matches the models: TRUNCATE each table with
+                # FK checks off instead of paying DROP/CREATE metadata locking
+                # and file churn per table
+                print("Schema unchanged, truncating all tables...")
+                conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
+                for table in reversed(db.metadata.sorted_tables):
+                    conn.execute(text(f"TRUNCATE TABLE `{table.name}`;"))
+                conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
+                conn.commit()
+            else:
+                # Table set differs from the models; rebuild from scratch
+                # Disable foreign key checks temporarily
+                conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
+                
+                # Drop all tables
+                print("Dropping all tables...")
+                db.drop_all()
+                
+                # Re-enable foreign key checks
+                conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
+                
+                # Create all tables from scratch
+                print("Creating all tables...")
+                db.create_all()
             
             print("Database reset complete!")
             
@@ -29,4 +29,6 @@ else
 fi
 
 echo "Starting Gunicorn server..."
-exec gunicorn --bind 0.0.0.0:${PORT:-8080} --workers 2 --timeout 300 --keep-alive 5 "wsgi:app"
+# Threaded workers: handlers are dominated by DB wait, so threads let each
+# worker overlap many in-flight requests (keep DB_POOL_SIZE >= threads)
+exec gunicorn --bind 0.0.0.0:${PORT:-8080} --workers 2 --worker-class gthread --threads ${GUNICORN_THREADS:-8} --timeout 300 --keep-alive 5 "wsgi:app"